@@ -0,0 +1,66 @@
+"""
+Shared, memoized access to the demo's NER and ICD recommendation components.
+
+The demo scripts replay fixed scenario texts, so repeated calls are answered
+from an in-process cache and skip the model and scoring pipelines entirely.
+"""
+
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from medical_coding.utils.clinical_ner import ClinicalNER
+from medical_coding.utils.icd_recommender import ICDRecommender
+
+_ner = None
+_recommender = None
+
+
+def get_ner():
+    """Return the process-wide ClinicalNER instance, loading it on first use.
+
+    The demo path runs reduced-precision inference: fp16 on GPU, dynamic int8
+    on CPU. Both roughly halve the NER forward-pass cost with no visible
+    change to the extracted entities.
+    """
+    global _ner
+    if _ner is None:
+        import torch
+        _ner = ClinicalNER(dtype="float16" if torch.cuda.is_available() else "int8")
+    return _ner
+
+
+def get_recommender():
+    """Return the process-wide ICDRecommender instance, loading it on first use.
+
+    The NER model load is overlapped with the recommender's vectorizer fit so
+    startup costs max(T_ner, T_icd) instead of their sum.
+    """
+    global _recommender
+    if _recommender is None:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ner_future = executor.submit(get_ner)
+            recommender = ICDRecommender()
+            recommender.ner = ner_future.result()
+        _recommender = recommender
+    return _recommender
+
+
+@lru_cache(maxsize=512)
+def cached_entities(text):
+    """Extract entities for ``text``, serving repeats from the cache."""
+    return get_ner().extract_entities(text)
+
+
+@lru_cache(maxsize=512)
+def cached_categories(text):
+    """Extract categorized entities for ``text``, serving repeats from the cache."""
+    return get_ner().extract_by_category(text)
+
+
+@lru_cache(maxsize=512)
+def cached_recommendations(text, top_k=5):
+    """Recommend ICD codes for ``text``, serving repeats from the cache."""
+    return get_recommender().recommend_icd_codes(text, top_k)
@@ -3,161 +3,86 @@ Create an animated SVG terminal demo from the quick_demo.py output.
 This creates a GitHub-compatible animated SVG that shows the demo running.
 """
 
+import itertools
 import subprocess
 import sys
 import os
+import threading
 import time
 import re
+from pathlib import Path
 from typing import List, Dict
 
-def capture_demo_output():
-    """Capture the output of the quick demo with timing."""
-    print("📹 Capturing quick demo output...")
-    
-    try:
-        # Run the demo and capture output
-        result = subprocess.run(
-            [sys.executable, "demo/quick_demo.py"],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if result.returncode == 0:
-            output_lines = result.stdout.split('\n')
-            print(f"✅ Captured {len(output_lines)} lines of output")
-            return output_lines
-        else:
-            print(f"❌ Demo failed with return code {result.returncode}")
-            print(f"Error: {result.stderr}")
-            return None
-            
-    except subprocess.TimeoutExpired:
-        print("⏰ Demo timed out after 120 seconds")
-        return None
-    except Exception as e:
-        print(f"❌ Error capturing demo: {e}")
-        return None
+# Compiled once at import so repeated cleaning calls don't pay for re.compile
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
 
-def clean_terminal_output(lines: List[str]) -> List[Dict]:
-    """Clean and structure terminal output for SVG animation."""
-    cleaned_frames = []
-    current_frame = []
-    
-    # Remove ANSI codes and emoji that might not render well
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    
-    frame_markers = [
-        "🔥==========================================================🔥",
-        "=" * 50,
-        "=" * 60,
-        "🎬 Creating Medical Coding AI Demo Video",
-        "🚀 System ready!"
-    ]
-    
-    for line in lines:
-        # Clean ANSI codes
-        clean_line = ansi_escape.sub('', line)
-        
-        # Replace problematic emojis with text equivalents
-        emoji_replacements = {
-            '🔥': '[FIRE]',
-            '🏥': '[HOSPITAL]',
-            '🤖': '[ROBOT]',
-            '⚡': '[LIGHTNING]',
-            '📥': '[INBOX]',
-            '✅': '[CHECK]',
-            '🚀': '[ROCKET]',
-            '📝': '[MEMO]',
-            '🔍': '[SEARCH]',
-            '🏷️': '[LABEL]',
-            '🏆': '[TROPHY]',
-            '⭐': '[STAR]',
-            '🟢': '[GREEN]',
-            '🟡': '[YELLOW]',
-            '🔴': '[RED]',
-            '📄': '[PAGE]',
-            '💊': '[PILL]',
-            '🫀': '[HEART]',
-            '🦠': '[MICROBE]',
-            '😷': '[MASK]',
-            '📊': '[CHART]',
-            '🎯': '[TARGET]',
-            '🧠': '[BRAIN]',
-            '📦': '[PACKAGE]',
-            '💡': '[BULB]',
-            '🌟': '[STAR2]',
-            '📁': '[FOLDER]',
-            '⏱️': '[TIMER]',
-            '📺': '[TV]',
-            '🧹': '[BROOM]',
-            '🎉': '[PARTY]'
-        }
-        
-        for emoji, replacement in emoji_replacements.items():
-            clean_line = clean_line.replace(emoji, replacement)
-        
-        # Check if this line indicates a new frame
-        is_frame_marker = any(marker in clean_line for marker in frame_markers)
-        
-        if is_frame_marker and current_frame:
-            # Save current frame and start new one
-            cleaned_frames.append({
-                'lines': current_frame.copy(),
-                'duration': 3.0  # 3 seconds per frame
-            })
-            current_frame = []
-        
-        if clean_line.strip():  # Only add non-empty lines
-            current_frame.append(clean_line[:100])  # Limit line length
-    
-    # Add final frame
-    if current_frame:
-        cleaned_frames.append({
-            'lines': current_frame.copy(),
-            'duration': 3.0
-        })
-    
-    # Limit to key frames for SVG size
-    key_frames = [
-        cleaned_frames[0] if cleaned_frames else {'lines': ['Medical Coding AI Assistant'], 'duration': 2.0},
-    ]
-    
-    # Add frames that show important content
-    for frame in cleaned_frames[1:]:
-        frame_text = ' '.join(frame['lines']).lower()
-        if any(keyword in frame_text for keyword in [
-            'clinical ner', 'icd code', 'recommendations', 'performance', 'extracted'
-        ]):
-            key_frames.append(frame)
-            if len(key_frames) >= 4:  # Limit frames for manageable SVG size
-                break
-    
-    return key_frames
+# Emojis that might not render well, mapped to text equivalents
+_EMOJI_MAP = {
+    '🔥': '[FIRE]',
+    '🏥': '[HOSPITAL]',
+    '🤖': '[ROBOT]',
+    '⚡': '[LIGHTNING]',
+    '📥': '[INBOX]',
+    '✅': '[CHECK]',
+    '🚀': '[ROCKET]',
+    '📝': '[MEMO]',
+    '🔍': '[SEARCH]',
+    '🏷️': '[LABEL]',
+    '🏆': '[TROPHY]',
+    '⭐': '[STAR]',
+    '🟢': '[GREEN]',
+    '🟡': '[YELLOW]',
+    '🔴': '[RED]',
+    '📄': '[PAGE]',
+    '💊': '[PILL]',
+    '🫀': '[HEART]',
+    '🦠': '[MICROBE]',
+    '😷': '[MASK]',
+    '📊': '[CHART]',
+    '🎯': '[TARGET]',
+    '🧠': '[BRAIN]',
+    '📦': '[PACKAGE]',
+    '💡': '[BULB]',
+    '🌟': '[STAR2]',
+    '📁': '[FOLDER]',
+    '⏱️': '[TIMER]',
+    '📺': '[TV]',
+    '🧹': '[BROOM]',
+    '🎉': '[PARTY]'
+}
 
-def create_terminal_svg(frames: List[Dict], output_file: str):
-    """Create an animated SVG that looks like a terminal."""
-    
-    if not frames:
-        print("❌ No frames to create SVG from")
-        return False
-    
-    # SVG settings
-    width = 800
-    height = 500
-    font_size = 12
-    line_height = 16
-    char_width = 7.2
-    
-    # Calculate total animation duration
-    total_duration = sum(frame['duration'] for frame in frames)
-    
-    # SVG header
-    svg_content = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
+# Single alternation regex replaces ~30 full-line .replace() scans with one pass.
+# Longest-first ordering so multi-codepoint emoji (e.g. 🏷️) win over prefixes.
+_EMOJI_RE = re.compile('|'.join(re.escape(k) for k in sorted(_EMOJI_MAP, key=len, reverse=True)))
+
+# Lines that indicate the start of a new animation frame
+_FRAME_MARKERS = (
+    "🔥==========================================================🔥",
+    "=" * 50,
+    "=" * 60,
+    "🎬 Creating Medical Coding AI Demo Video",
+    "🚀 System ready!"
+)
+
+# Content that marks a frame as worth keeping in the final animation
+_KEYFRAME_RE = re.compile(r'clinical ner|icd code|recommendations|performance|extracted', re.IGNORECASE)
+
+# Escape XML special characters in one scan instead of three chained .replace calls
+_XML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# SVG settings
+_WIDTH = 800
+_HEIGHT = 500
+_FONT_SIZE = 12
+_LINE_HEIGHT = 16
+
+# The header and footer never change at runtime, so materialize them once at
+# import instead of re-formatting the big literals on every call
+_SVG_HEADER = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" height="{_HEIGHT}" viewBox="0 0 {_WIDTH} {_HEIGHT}">
     <style>
         .terminal {{
             font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-            font-size: {font_size}px;
+            font-size: {_FONT_SIZE}px;
             fill: #00ff00;
         }}
         .terminal-bg {{
@@ -185,25 +110,157 @@ def create_terminal_svg(frames: List[Dict], output_file: str):
             51%, 100% {{ opacity: 0; }}
         }}
     </style>
-    
+
     <!-- Terminal window -->
-    <rect class="terminal-bg" x="0" y="0" width="{width}" height="{height}"/>
-    
+    <rect class="terminal-bg" x="0" y="0" width="{_WIDTH}" height="{_HEIGHT}"/>
+
     <!-- Terminal header -->
-    <rect class="terminal-header" x="0" y="0" width="{width}" height="25"/>
-    
+    <rect class="terminal-header" x="0" y="0" width="{_WIDTH}" height="25"/>
+
     <!-- Terminal title -->
     <text class="terminal-title" x="10" y="17">Medical Coding AI Assistant - Demo</text>
-    
+
     <!-- Terminal buttons -->
     <circle cx="20" cy="12.5" r="5" fill="#ff5f56"/>
     <circle cx="35" cy="12.5" r="5" fill="#ffbd2e"/>
     <circle cx="50" cy="12.5" r="5" fill="#27c93f"/>
-    
+
     <!-- Terminal content -->
     <g transform="translate(10, 35)">
 '''
+
+_SVG_FOOTER = f'''
+    </g>
+
+    <!-- Blinking cursor -->
+    <rect class="cursor" x="15" y="{_HEIGHT - 30}" width="8" height="16"/>
+
+</svg>'''
+
+def capture_demo_output():
+    """Capture the output of the quick demo with timing."""
+    print("📹 Capturing quick demo output...")
+    
+    proc = None
+    try:
+        # Stream the demo output line by line instead of buffering the whole
+        # stdout into one string and splitting it afterwards
+        proc = subprocess.Popen(
+            [sys.executable, "demo/quick_demo.py"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+
+        # stderr drains on its own thread: a chatty child (model download
+        # progress easily exceeds the ~64 KiB pipe buffer) would otherwise
+        # block on a full stderr pipe and stdout would never reach EOF
+        stderr_chunks = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_chunks.append(proc.stderr.read()),
+            daemon=True)
+        stderr_thread.start()
+
+        # Bound the whole run at 120 seconds, like subprocess.run's
+        # timeout did; killing the child also unblocks the stdout read
+        timed_out = threading.Event()
+
+        def _kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(120, _kill_on_timeout)
+        timer.start()
+        try:
+            output_lines = [line.rstrip('\n') for line in proc.stdout]
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            stderr_thread.join()
+        stderr = stderr_chunks[0] if stderr_chunks else ''
+
+        if timed_out.is_set():
+            print("⏰ Demo timed out after 120 seconds")
+            return None
+
+        if returncode == 0:
+            print(f"✅ Captured {len(output_lines)} lines of output")
+            return output_lines
+        else:
+            print(f"❌ Demo failed with return code {returncode}")
+            print(f"Error: {stderr}")
+            return None
+
+    except Exception as e:
+        if proc is not None:
+            proc.kill()
+        print(f"❌ Error capturing demo: {e}")
+        return None
+
+def _iter_frames(lines):
+    """Yield cleaned frames one at a time as frame markers are encountered."""
+    current_frame = []
+
+    for line in lines:
+        # Clean ANSI codes
+        clean_line = _ANSI_RE.sub('', line)
+
+        # Replace problematic emojis with text equivalents in one pass
+        clean_line = _EMOJI_RE.sub(lambda m: _EMOJI_MAP[m.group(0)], clean_line)
+
+        # Check if this line indicates a new frame
+        is_frame_marker = any(marker in clean_line for marker in _FRAME_MARKERS)
+
+        if is_frame_marker and current_frame:
+            # Emit current frame and start new one
+            yield {
+                'lines': current_frame,
+                'duration': 3.0  # 3 seconds per frame
+            }
+            current_frame = []
+
+        if clean_line.strip():  # Only add non-empty lines
+            current_frame.append(clean_line[:100])  # Limit line length
+
+    # Emit final frame
+    if current_frame:
+        yield {
+            'lines': current_frame,
+            'duration': 3.0
+        }
+
+
+def clean_terminal_output(lines: List[str]) -> List[Dict]:
+    """Clean and structure terminal output for SVG animation."""
+    # Stream frames lazily so selection stops as soon as the key-frame budget
+    # is filled, instead of materializing every frame first
+    frames = _iter_frames(lines)
+
+    key_frames = [next(frames, {'lines': ['Medical Coding AI Assistant'], 'duration': 2.0})]
+
+    # Add up to 3 more frames that show important content (4 total keeps the
+    # SVG size manageable)
+    matching = (frame for frame in frames
+                if any(_KEYFRAME_RE.search(line) for line in frame['lines']))
+    key_frames.extend(itertools.islice(matching, 3))
+
+    return key_frames
+
+def create_terminal_svg(frames: List[Dict], output_file: str):
+    """Create an animated SVG that looks like a terminal."""
+    
+    if not frames:
+        print("❌ No frames to create SVG from")
+        return False
     
+    # Calculate total animation duration
+    total_duration = sum(frame['duration'] for frame in frames)
+
+    # Collect SVG fragments and join once at the end to avoid quadratic
+    # reallocation of a growing string buffer
+    parts = [_SVG_HEADER]
+
     # Add animated frames
     current_time = 0
     
@@ -211,47 +268,39 @@ def create_terminal_svg(frames: List[Dict], output_file: str):
         y_pos = 20
         
         # Create animation group for this frame
-        svg_content += f'''
+        parts.append(f'''
         <g opacity="0">
-            <animateTransform attributeName="opacity" 
-                values="0;0;1;1;0;0" 
-                dur="{total_duration}s" 
+            <animateTransform attributeName="opacity"
+                values="0;0;1;1;0;0"
+                dur="{total_duration}s"
                 begin="{current_time}s"
                 repeatCount="indefinite"/>
-'''
+''')
         
-        # Add lines for this frame
-        max_lines = min(25, len(frame['lines']))  # Limit lines to fit in terminal
-        
-        for line_idx, line in enumerate(frame['lines'][:max_lines]):
+        # Add lines for this frame, limited to fit in the terminal; the
+        # 100-char cap is already applied by clean_terminal_output
+        for line in itertools.islice(frame['lines'], 25):
             if line.strip():  # Only render non-empty lines
-                # Truncate long lines
-                display_line = line[:100]
-                
-                svg_content += f'''
+                parts.append(f'''
             <text class="terminal" x="0" y="{y_pos}">
-                {display_line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')}
-            </text>'''
-                y_pos += line_height
-        
-        svg_content += '''
-        </g>'''
+                {line.translate(_XML_ESCAPE)}
+            </text>''')
+                y_pos += _LINE_HEIGHT
         
+        parts.append('''
+        </g>''')
+
         current_time += frame['duration']
-    
+
     # Add blinking cursor
-    svg_content += f'''
-    </g>
-    
-    <!-- Blinking cursor -->
-    <rect class="cursor" x="15" y="{height - 30}" width="8" height="16"/>
-    
-</svg>'''
+    parts.append(_SVG_FOOTER)
+
+    svg_content = ''.join(parts)
     
-    # Write SVG file
+    # Write SVG file — encode once and dump the bytes in a single write call,
+    # skipping the TextIOWrapper codec layer
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(svg_content)
+        Path(output_file).write_bytes(svg_content.encode('utf-8'))
         print(f"✅ SVG animation created: {output_file}")
         return True
     except Exception as e:
@@ -8,8 +8,13 @@ import os
 import time
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from medical_coding.utils.clinical_ner import ClinicalNER
-from medical_coding.utils.icd_recommender import ICDRecommender
+from _cache import get_ner, get_recommender
+
+
+def _emit(lines):
+    """Write a block of output lines with one stdout write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def print_header(title):
@@ -26,11 +31,10 @@ def print_section(title):
 
 
 def animate_loading(text, duration=1.5):
-    """Animate loading text for visual effect."""
-    print(f"{text}", end="", flush=True)
-    for i in range(int(duration * 4)):
-        print(".", end="", flush=True)
-        time.sleep(0.25)
+    """Show loading text for visual effect with a single buffered write."""
+    sys.stdout.write(f"{text}{'.' * int(duration * 4)}")
+    sys.stdout.flush()
+    time.sleep(duration)
     print(" ✅\n")
 
 
@@ -43,12 +47,14 @@ def main():
     print("⚡ Real-time clinical text analysis and ICD code suggestions")
     print()
     
-    # Initialize systems with visual loading
+    # Initialize systems with visual loading; the shared factories memoize
+    # the instances, so a session that also runs the interactive demo only
+    # loads each model once
     animate_loading("📥 Loading Clinical NER model", 1)
-    ner = ClinicalNER()
-    
+    ner = get_ner()
+
     animate_loading("📥 Loading ICD Recommendation engine", 1)
-    recommender = ICDRecommender()
+    recommender = get_recommender()
     
     print("🚀 System ready! Let's see it in action...\n")
     
@@ -70,8 +76,8 @@ def main():
     
     animate_loading("\n🔍 Extracting medical entities", 2)
     
-    entities = ner.extract_entities(sample_case)
-    categories = ner.extract_by_category(sample_case)
+    # One NER pass yields both the flat entity list and the category grouping
+    entities, categories = ner.extract_entities_and_categories(sample_case)
     
     print(f"✅ EXTRACTED {len(entities)} MEDICAL ENTITIES:\n")
     
@@ -83,11 +89,13 @@ def main():
         'ANATOMY': '🫀'
     }
     
+    category_lines = []
     for category, terms in categories.items():
         emoji = emoji_map.get(category, '🏷️')
-        print(f"{emoji} {category}: {', '.join(terms[:4])}")
+        category_lines.append(f"{emoji} {category}: {', '.join(terms[:4])}")
         if len(terms) > 4:
-            print(f"   ... and {len(terms) - 4} more")
+            category_lines.append(f"   ... and {len(terms) - 4} more")
+    _emit(category_lines)
     
     # ========== DEMO 2: ICD RECOMMENDATIONS ==========
     print_header("DEMO 2: ICD CODE RECOMMENDATIONS")
@@ -107,16 +115,19 @@ def main():
         }
     ]
     
-    for i, test_case in enumerate(test_cases, 1):
+    # One batched call answers all three cases; the loop only renders
+    all_recommendations = recommender.batch_recommend(
+        [test_case['case'] for test_case in test_cases], top_k=3)
+
+    for i, (test_case, recommendations) in enumerate(zip(test_cases, all_recommendations), 1):
         print_section(f"{test_case['description']} #{i}")
         print(f"📝 Diagnosis: {test_case['case']}")
-        
+
         animate_loading("🎯 Analyzing and generating ICD recommendations", 1.5)
-        
-        recommendations = recommender.recommend_icd_codes(test_case['case'], top_k=3)
-        
+
         print("🏆 TOP 3 ICD RECOMMENDATIONS:\n")
-        
+
+        rec_lines = []
         for rank, rec in enumerate(recommendations, 1):
             # Visual confidence indicators
             if rec['confidence_score'] > 0.3:
@@ -128,14 +139,15 @@ def main():
             else:
                 confidence_visual = "🔴🔴🔴 LOW"
                 stars = "⭐"
-            
-            print(f"{stars} {rank}. {rec['icd_code']} | {confidence_visual}")
-            print(f"     📄 {rec['description']}")
-            print(f"     🏥 {rec['category']} | Score: {rec['confidence_score']:.3f}")
-            
+
+            rec_lines.append(f"{stars} {rank}. {rec['icd_code']} | {confidence_visual}")
+            rec_lines.append(f"     📄 {rec['description']}")
+            rec_lines.append(f"     🏥 {rec['category']} | Score: {rec['confidence_score']:.3f}")
+
             if rec['matched_keywords']:
-                print(f"     🔍 Keywords: {', '.join(rec['matched_keywords'][:3])}")
-            print()
+                rec_lines.append(f"     🔍 Keywords: {', '.join(rec['matched_keywords'][:3])}")
+            rec_lines.append("")
+        _emit(rec_lines)
     
     # ========== DEMO 3: REAL-TIME WORKFLOW ==========
     print_header("DEMO 3: MEDICAL CODER WORKFLOW SIMULATION")
@@ -151,19 +163,22 @@ def main():
         "Pneumonia with sepsis and respiratory failure"
     ]
     
-    animate_loading("🔄 Batch processing 5 cases", 2)
-    
+    # Time the one batched call instead of faking serial work with a pause
+    batch_start = time.time()
     batch_results = recommender.batch_recommend(daily_cases, top_k=1)
+    batch_elapsed = (time.time() - batch_start) * 1000
+
+    print(f"✅ BATCH PROCESSING RESULTS ({len(daily_cases)} cases in {batch_elapsed:.0f}ms):\n")
     
-    print("✅ BATCH PROCESSING RESULTS:\n")
-    
+    batch_lines = []
     for i, (case, results) in enumerate(zip(daily_cases, batch_results), 1):
         if results:
             top_result = results[0]
             confidence_emoji = "🎯" if top_result['confidence_score'] > 0.2 else "📍"
-            print(f"{confidence_emoji} Case {i}: {case[:45]}...")
-            print(f"    → {top_result['icd_code']} ({top_result['confidence_score']:.3f}) - {top_result['description'][:50]}...")
-        print()
+            batch_lines.append(f"{confidence_emoji} Case {i}: {case[:45]}...")
+            batch_lines.append(f"    → {top_result['icd_code']} ({top_result['confidence_score']:.3f}) - {top_result['description'][:50]}...")
+        batch_lines.append("")
+    _emit(batch_lines)
     
     # ========== SYSTEM PERFORMANCE ==========
     print_header("SYSTEM PERFORMANCE & CAPABILITIES")
@@ -179,8 +194,7 @@ def main():
         ("💡 Smart Features", "Abbreviation expansion, fallback matching")
     ]
     
-    for metric, value in metrics:
-        print(f"{metric:25} : {value}")
+    _emit([f"{metric:25} : {value}" for metric, value in metrics])
     
     # Quick performance test
     print(f"\n⚡ LIVE PERFORMANCE TEST:")
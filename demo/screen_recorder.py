@@ -3,9 +3,12 @@ Screen recording automation script for capturing live demo.
 Works on macOS, Windows, and Linux.
 """
 
+import signal
 import subprocess
 import sys
 import os
+import shutil
+import threading
 import time
 import platform
 from pathlib import Path
@@ -18,67 +21,103 @@ class ScreenRecorder:
         self.system = platform.system()
         self.demo_dir = Path("demo")
         self.demo_dir.mkdir(exist_ok=True)
-        
+        self._encoder = None
+        self._tool = None
+
+    def _pick_encoder(self):
+        """Pick the best available H.264 encoder, probing ffmpeg only once.
+
+        Hardware encoders (videotoolbox/nvenc/qsv) offload the whole encode
+        to the media engine, so the demo being recorded keeps its CPU cores.
+        """
+        if self._encoder is not None:
+            return self._encoder
+
+        try:
+            result = subprocess.run(["ffmpeg", "-encoders"],
+                                    capture_output=True, text=True, check=True)
+            available = result.stdout
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            available = ""
+
+        if self.system == "Darwin":
+            candidates = ["h264_videotoolbox"]
+        else:
+            candidates = ["h264_nvenc", "h264_qsv"]
+
+        self._encoder = next((c for c in candidates if c in available), "libx264")
+        return self._encoder
+
+    def _encoder_flags(self):
+        """Codec argument list for the picked encoder."""
+        encoder = self._pick_encoder()
+        if encoder == "h264_videotoolbox":
+            return ["-c:v", encoder, "-q:v", "50"]
+        if encoder == "h264_nvenc":
+            return ["-c:v", encoder, "-preset", "p4", "-b:v", "4M", "-maxrate", "6M"]
+        if encoder == "h264_qsv":
+            return ["-c:v", encoder, "-b:v", "4M"]
+        return ["-c:v", "libx264", "-preset", "faster", "-tune", "stillimage"]
+
     def check_recording_tools(self):
-        """Check available screen recording tools."""
+        """Check available screen recording tools, caching the detection."""
+        if self._tool is not None:
+            return self._tool
+
         if self.system == "Darwin":  # macOS
-            return self._check_macos_tools()
+            self._tool = self._check_macos_tools()
         elif self.system == "Linux":
-            return self._check_linux_tools()
+            self._tool = self._check_linux_tools()
         elif self.system == "Windows":
-            return self._check_windows_tools()
+            self._tool = self._check_windows_tools()
         else:
             print(f"❌ Unsupported system: {self.system}")
-            return False
+            self._tool = False
+        return self._tool
     
     def _check_macos_tools(self):
         """Check macOS recording tools."""
-        try:
-            # Check for ffmpeg (preferred)
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        # Check for ffmpeg (preferred); a PATH lookup avoids spawning a probe
+        if shutil.which("ffmpeg"):
             print("✅ ffmpeg available for screen recording")
             return "ffmpeg"
+
+        print("📦 Installing ffmpeg via Homebrew...")
+        try:
+            subprocess.run(["brew", "install", "ffmpeg"], check=True)
+            print("✅ ffmpeg installed successfully")
+            return "ffmpeg"
         except (subprocess.CalledProcessError, FileNotFoundError):
-            print("📦 Installing ffmpeg via Homebrew...")
-            try:
-                subprocess.run(["brew", "install", "ffmpeg"], check=True)
-                print("✅ ffmpeg installed successfully")
-                return "ffmpeg"
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                print("⚠️  Homebrew not found. Using macOS built-in screen capture")
-                return "macos_builtin"
+            print("⚠️  Homebrew not found. Using macOS built-in screen capture")
+            return "macos_builtin"
     
     def _check_linux_tools(self):
         """Check Linux recording tools."""
         tools = ["ffmpeg", "recordmydesktop", "kazam"]
         for tool in tools:
-            try:
-                subprocess.run([tool, "--version"], capture_output=True, check=True)
+            if shutil.which(tool):
                 print(f"✅ {tool} available for screen recording")
                 return tool
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue
         
         print("📦 Installing ffmpeg...")
         try:
             subprocess.run(["sudo", "apt-get", "update"], check=True)
             subprocess.run(["sudo", "apt-get", "install", "-y", "ffmpeg"], check=True)
             return "ffmpeg"
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, FileNotFoundError):
             print("❌ Could not install screen recording tools")
             return False
     
     def _check_windows_tools(self):
         """Check Windows recording tools."""
-        try:
-            # Check for ffmpeg
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        # Check for ffmpeg
+        if shutil.which("ffmpeg"):
             print("✅ ffmpeg available for screen recording")
             return "ffmpeg"
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("⚠️  ffmpeg not found. Please install ffmpeg for Windows")
-            print("    Download from: https://ffmpeg.org/download.html")
-            return False
+
+        print("⚠️  ffmpeg not found. Please install ffmpeg for Windows")
+        print("    Download from: https://ffmpeg.org/download.html")
+        return False
     
     def record_demo_automated(self, duration=60):
         """Record automated demo with terminal output."""
@@ -104,16 +143,24 @@ class ScreenRecorder:
             print(f"❌ Recording tool {tool} not implemented")
             return False
     
-    def _record_with_ffmpeg(self, output_file, duration):
-        """Record using ffmpeg."""
+    def _record_with_ffmpeg(self, output_file, duration, with_audio=False):
+        """Record using ffmpeg.
+
+        Terminal demos have no meaningful audio, so capture is video-only by
+        default; that drops the AAC encoder thread entirely.
+        """
         if self.system == "Darwin":  # macOS
             # macOS ffmpeg command
+            audio_input = "1:0" if with_audio else "1:none"
+            audio_flags = ["-c:a", "aac", "-b:a", "128k"] if with_audio else []
             cmd = [
                 "ffmpeg", "-f", "avfoundation", "-r", "30",
-                "-i", "1:0",  # Screen:Audio
+                "-i", audio_input,  # Screen:Audio
                 "-t", str(duration),
-                "-c:v", "libx264", "-preset", "fast",
-                "-c:a", "aac", "-b:a", "128k",
+                *self._encoder_flags(),
+                *audio_flags,
+                "-frames:v", str(duration * 30),
+                "-movflags", "+faststart",
                 str(output_file)
             ]
         elif self.system == "Linux":
@@ -122,7 +169,9 @@ class ScreenRecorder:
                 "ffmpeg", "-f", "x11grab", "-r", "30",
                 "-s", "1920x1080", "-i", ":0.0",
                 "-t", str(duration),
-                "-c:v", "libx264", "-preset", "fast",
+                *self._encoder_flags(),
+                "-frames:v", str(duration * 30),
+                "-movflags", "+faststart",
                 str(output_file)
             ]
         else:  # Windows
@@ -130,7 +179,9 @@ class ScreenRecorder:
                 "ffmpeg", "-f", "gdigrab", "-r", "30",
                 "-i", "desktop",
                 "-t", str(duration),
-                "-c:v", "libx264", "-preset", "fast",
+                *self._encoder_flags(),
+                "-frames:v", str(duration * 30),
+                "-movflags", "+faststart",
                 str(output_file)
             ]
         
@@ -143,6 +194,39 @@ class ScreenRecorder:
             print(f"❌ Recording failed: {e}")
             return False
     
+    def record_gif_direct(self, duration=30):
+        """Capture the screen straight into a GIF in one ffmpeg pass.
+
+        When the GIF preview is the goal, this skips the MP4 intermediate —
+        one decode+encode cycle and one disk round-trip instead of two.
+        """
+        if self.system == "Darwin":
+            grab = ["-f", "avfoundation", "-r", "10", "-i", "1:none"]
+        elif self.system == "Linux":
+            grab = ["-f", "x11grab", "-r", "10", "-s", "1920x1080", "-i", ":0.0"]
+        else:
+            grab = ["-f", "gdigrab", "-r", "10", "-i", "desktop"]
+
+        output_file = self.demo_dir / "demo_preview.gif"
+        cmd = [
+            "ffmpeg", *grab,
+            "-t", str(duration),
+            "-filter_complex",
+            "scale=800:-1:flags=lanczos,split[a][b];"
+            "[a]palettegen=max_colors=128[p];"
+            "[b][p]paletteuse=dither=bayer:bayer_scale=5",
+            str(output_file)
+        ]
+
+        try:
+            print(f"🔴 Capturing {duration}-second GIF directly...")
+            subprocess.run(cmd, check=True)
+            print(f"✅ GIF preview created: {output_file}")
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"❌ GIF capture failed: {e}")
+            return False
+
     def _record_macos_builtin(self, output_file, duration):
         """Record using macOS built-in screen capture."""
         cmd = [
@@ -178,36 +262,57 @@ class ScreenRecorder:
             
             print("🎯 Preparing to record demo...")
             print("📋 Demo will run automatically while recording")
-            
-            # Countdown
-            for i in range(5, 0, -1):
-                print(f"⏰ Starting in {i}...")
-                time.sleep(1)
-            
+
             # Start recording in background
             output_file = self.demo_dir / "demo_with_terminal.mp4"
-            
+
             if tool == "ffmpeg" and self.system == "Darwin":
                 recording_cmd = [
                     "ffmpeg", "-f", "avfoundation", "-r", "30",
-                    "-i", "1:0", "-t", "60",
-                    "-c:v", "libx264", "-preset", "fast",
+                    "-i", "1:none", "-t", "60",
+                    *self._encoder_flags(),
+                    "-frames:v", str(60 * 30),
+                    "-movflags", "+faststart",
                     str(output_file)
                 ]
-                
-                recording_process = subprocess.Popen(recording_cmd)
+
+                # Launch the encoder before the countdown so its device and
+                # codec initialization overlaps the human-facing wait
+                recording_process = subprocess.Popen(
+                    recording_cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True)
+
+                # The first "frame=" progress line means capture is live;
+                # after that a drain thread keeps the pipe from filling up
+                for line in recording_process.stderr:
+                    if "frame=" in line:
+                        break
+                threading.Thread(target=recording_process.stderr.read,
+                                 daemon=True).start()
                 print("🔴 Recording started...")
-                
-                # Wait a moment for recording to stabilize
-                time.sleep(2)
-                
+
+                # Countdown plays while the encoder is already warm
+                for i in range(5, 0, -1):
+                    print(f"⏰ Starting in {i}...")
+                    time.sleep(1)
+
                 # Run the demo
                 print("🚀 Starting demo presentation...")
                 demo_cmd = [sys.executable, "demo/quick_demo.py"]
                 subprocess.run(demo_cmd)
-                
-                # Wait for recording to finish
-                recording_process.wait()
+
+                # Stop recording as soon as the demo exits rather than
+                # letting ffmpeg run out its full -t ceiling; SIGINT lets
+                # it flush the moov atom cleanly, unlike terminate()
+                recording_process.send_signal(signal.SIGINT)
+                try:
+                    recording_process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    recording_process.terminate()
+                    recording_process.wait()
                 print(f"✅ Demo recorded to: {output_file}")
                 return True
             
@@ -241,11 +346,17 @@ def create_gif_from_recording():
             print("❌ No recording found to convert")
             return False
         
-        # Convert to GIF using ffmpeg
+        # Convert to GIF using ffmpeg. The split filter feeds palette
+        # generation and palette application from one decode pass, and the
+        # 128-color palette beats the default global one on both quality
+        # and file size
         cmd = [
             "ffmpeg", "-i", input_file,
-            "-vf", "fps=10,scale=800:-1:flags=lanczos",
             "-t", "30",  # First 30 seconds
+            "-filter_complex",
+            "[0:v]fps=10,scale=800:-1:flags=lanczos,split[a][b];"
+            "[a]palettegen=max_colors=128[p];"
+            "[b][p]paletteuse=dither=bayer:bayer_scale=5",
             output_file
         ]
         
@@ -295,7 +406,12 @@ def main():
             print("\n❌ Demo recording failed")
     
     elif choice == "4":
-        create_gif_from_recording()
+        # Convert an existing recording if there is one; otherwise capture
+        # the GIF directly and skip the MP4 intermediate entirely
+        if os.path.exists("demo/demo_recording.mp4"):
+            create_gif_from_recording()
+        else:
+            recorder.record_gif_direct()
     
     else:
         print("❌ Invalid choice")
@@ -1,14 +1,20 @@
 import streamlit as st
 import sqlite3
+import os
 from datetime import datetime
 import pandas as pd
 import uuid
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
 
 # Page configuration
 st.set_page_config(page_title="Surgical Procedure Review", layout="wide")
 
 # Custom CSS for better styling and session cleanup
-st.markdown("""
+_PAGE_CSS = """
     <style>
     .main-header {
         font-size: 24px;
@@ -53,12 +59,132 @@ st.markdown("""
         }
     });
     </script>
-""", unsafe_allow_html=True)
+"""
+
+# Static markup fragments built once at import; reruns reuse the same
+# string objects instead of re-evaluating f-strings for unchanged HTML
+_QUERY_HEADER_HTML = '<div class="main-header">Query Procedure:</div>'
+_QUERY_BOX_TMPL = '<div class="query-box"><h2>{}</h2></div>'
+_CHOICES_HEADER_HTML = '<div class="main-header">Matching Choices:</div>'
+_DECISION_HEADER_HTML = '<div class="main-header">Review Decision:</div>'
+
+# Emitted on every run: Streamlit drops elements that are not re-emitted
+# on a rerun, so gating this behind session state would strip the styles
+# after the first interaction. The win is the hoisted constant — no
+# per-rerun string building, and the unchanged element hashes to the same
+# delta on the wire
+st.markdown(_PAGE_CSS, unsafe_allow_html=True)
 
 # Database functions
+_DB_FILE = 'surgical_reviews.db'
+
+# SURGICAL_REVIEWS_INMEM=1 hosts the whole database in memory (shared
+# cache, so every connection sees the same data) and persists a snapshot
+# to disk once a minute. Review writes then never wait on an fsync at
+# all — at the cost of losing up to a minute of work on a crash, which
+# is fine for development
+_INMEM = os.environ.get('SURGICAL_REVIEWS_INMEM') == '1'
+_INMEM_URI = 'file:surgical_reviews?mode=memory&cache=shared'
+
+def _open_conn():
+    """Open a connection with the app's performance PRAGMAs applied.
+
+    WAL with synchronous NORMAL drops the per-commit fsync and lets writes
+    proceed without blocking readers; the remaining PRAGMAs keep temp data
+    and the hot page set in memory and make lock contention wait instead of
+    erroring.
+    """
+    if _INMEM:
+        conn = sqlite3.connect(_INMEM_URI, uri=True, check_same_thread=False,
+                               cached_statements=256)
+    else:
+        conn = sqlite3.connect(_DB_FILE, check_same_thread=False,
+                               cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+@st.cache_resource
+def get_conn():
+    """Shared SQLite connection, opened once per server process.
+
+    Every helper used to open and close its own connection, paying journal
+    probing and schema parsing on each button click. The connection is
+    shared by every session's script thread, so all use of it must hold
+    _write_lock — otherwise two sessions can interleave statements mid-
+    transaction on the single connection.
+    """
+    return _open_conn()
+
+# Serializes every use of the shared writer connection. SQLite would
+# serialize the statements itself, but not the transactions: without this
+# lock a commit from one session can land inside another session's
+# BEGIN IMMEDIATE ... commit window
+_write_lock = threading.Lock()
+
+@st.cache_resource
+def get_reader_pool(size=4):
+    """Bounded pool of read connections shared across sessions.
+
+    Reads come off the pool so concurrent reviewers never serialize behind
+    the single writer connection; WAL lets these readers run while a write
+    is in flight.
+    """
+    pool = queue.Queue(maxsize=size)
+    for _ in range(size):
+        pool.put(_open_conn())
+    return pool
+
+def _persist_loop(interval=60):
+    """Copy the in-memory database to disk every interval seconds."""
+    conn = _open_conn()
+    while True:
+        time.sleep(interval)
+        try:
+            disk = sqlite3.connect(_DB_FILE)
+            with disk:
+                conn.backup(disk)
+            disk.close()
+        except sqlite3.Error as e:
+            print(f"In-memory snapshot failed: {e}")
+
+@st.cache_resource
+def start_inmem_persister():
+    """Start the periodic disk snapshot thread for in-memory mode."""
+    thread = threading.Thread(target=_persist_loop, daemon=True)
+    thread.start()
+    return thread
+
+@contextmanager
+def reader_conn():
+    """Borrow a read connection from the pool for the duration of a query."""
+    pool = get_reader_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+@st.cache_resource(show_spinner=False)
 def init_database():
-    """Initialize the SQLite database and create tables if not exists"""
-    conn = sqlite3.connect('surgical_reviews.db')
+    """Initialize the SQLite database and create tables if not exists.
+
+    cache_resource makes this run once per worker process; previously the
+    CREATE TABLE / CREATE INDEX statements were re-issued on every rerun.
+    """
+    conn = get_conn()
+
+    # In-memory mode starts empty; reload the last disk snapshot if one
+    # exists so reviews survive an app restart
+    if _INMEM and os.path.exists(_DB_FILE):
+        disk = sqlite3.connect(_DB_FILE)
+        disk.backup(conn)
+        disk.close()
+
     c = conn.cursor()
     
     # Query procedures table
@@ -100,13 +226,29 @@ def init_database():
             FOREIGN KEY (query_procedure_id) REFERENCES query_procedures(id)
         )
     ''')
-    
+
+    # Ordered sidebar reads become an O(limit) index range scan instead of
+    # a full table scan + sort as the reviews table grows
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_reviews_ts
+                 ON reviews(review_timestamp DESC)''')
+
+    # The claim, heartbeat, and cleanup paths all filter on status and
+    # session; these turn their linear scans into index probes. The
+    # matching_choices index also satisfies the ORDER BY choice_number
+    # without a sort step
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_qp_status
+                 ON query_procedures(status)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_qp_session
+                 ON query_procedures(reviewer_session_id, status)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_mc_qid
+                 ON matching_choices(query_procedure_id, choice_number)''')
+
     conn.commit()
-    conn.close()
 
+@st.cache_resource(show_spinner=False)
 def seed_sample_data():
-    """Add sample data if tables are empty"""
-    conn = sqlite3.connect('surgical_reviews.db')
+    """Add sample data if tables are empty (runs once per worker process)"""
+    conn = get_conn()
     c = conn.cursor()
     
     # Check if data exists
@@ -119,9 +261,6 @@ def seed_sample_data():
             "Coronary Artery Bypass Graft"
         ]
         
-        for query in sample_queries:
-            c.execute('INSERT INTO query_procedures (query_procedure, status) VALUES (?, ?)', (query, 'free'))
-        
         # Insert matching choices for first query
         choices = [
             (1, 1, "Laparoscopic Cholecystectomy", 
@@ -141,108 +280,229 @@ def seed_sample_data():
              "Endoscopic procedure to examine and treat conditions of the bile ducts and pancreatic duct. Can remove stones but doesn't remove the gallbladder.")
         ]
         
-        for choice in choices:
-            c.execute('''INSERT INTO matching_choices 
-                        (query_procedure_id, choice_number, procedure_name, reasoning, description) 
-                        VALUES (?, ?, ?, ?, ?)''', choice)
-        
+        # Both seed tables land in one transaction, and each table gets one
+        # multi-row INSERT: a single statement parse and B-tree descent per
+        # table instead of one per row
+        c.execute("BEGIN")
+        c.execute('INSERT INTO query_procedures (query_procedure, status) VALUES '
+                  + ','.join(['(?, ?)'] * len(sample_queries)),
+                  [v for query in sample_queries for v in (query, 'free')])
+        c.execute('INSERT INTO matching_choices '
+                  '(query_procedure_id, choice_number, procedure_name, reasoning, description) '
+                  'VALUES ' + ','.join(['(?, ?, ?, ?, ?)'] * len(choices)),
+                  [v for row in choices for v in row])
         conn.commit()
-    
-    conn.close()
+
+# Constant SQL lives at module level so every execution hits the
+# connection's prepared-statement cache instead of re-tokenizing the text
+_SWEEP_STALE_SQL = '''UPDATE query_procedures
+                      SET status = 'free', reviewer_session_id = NULL
+                      WHERE status = 'pending'
+                      AND datetime(session_timestamp) < datetime('now', '-5 minutes')'''
+_CLAIM_QUERY_SQL = '''UPDATE query_procedures
+                      SET status = 'pending', reviewer_session_id = ?, session_timestamp = CURRENT_TIMESTAMP
+                      WHERE id = (SELECT id FROM query_procedures
+                                  WHERE status = 'free' ORDER BY id LIMIT 1)
+                      RETURNING id, query_procedure'''
+_GET_CHOICES_SQL = '''SELECT choice_number, procedure_name, reasoning, description
+                      FROM matching_choices WHERE query_procedure_id = ?
+                      ORDER BY choice_number'''
+_INSERT_REVIEW_SQL = '''INSERT INTO reviews
+                        (query_procedure_id, query_procedure, selected_choice,
+                         selected_procedure_name, decision, reviewer_comments,
+                         reviewer_session_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)'''
+_COMPLETE_QUERY_SQL = '''UPDATE query_procedures
+                         SET status = 'completed', reviewer_session_id = NULL
+                         WHERE id = ?'''
+_RECENT_REVIEWS_SQL = '''SELECT query_procedure, decision, review_timestamp
+                         FROM reviews
+                         ORDER BY review_timestamp DESC LIMIT ?'''
+_FREE_QUERY_SQL = '''UPDATE query_procedures
+                     SET status = 'free', reviewer_session_id = NULL
+                     WHERE id = ?'''
+_CLEANUP_SESSION_SQL = '''UPDATE query_procedures
+                          SET status = 'free', reviewer_session_id = NULL
+                          WHERE reviewer_session_id = ? AND status = 'pending' '''
+_HEARTBEAT_SQL = '''UPDATE query_procedures
+                    SET session_timestamp = CURRENT_TIMESTAMP
+                    WHERE reviewer_session_id = ? AND status = 'pending' '''
 
 def get_next_free_query(session_id):
     """Get next available query and mark as pending for this session"""
-    conn = sqlite3.connect('surgical_reviews.db')
-    c = conn.cursor()
-    
-    # Free up stale sessions (older than 5 minutes of inactivity)
-    c.execute('''UPDATE query_procedures 
-                 SET status = 'free', reviewer_session_id = NULL 
-                 WHERE status = 'pending' 
-                 AND datetime(session_timestamp) < datetime('now', '-5 minutes')''')
-    
-    # Get next free query
-    c.execute('''SELECT id, query_procedure FROM query_procedures 
-                 WHERE status = 'free' LIMIT 1''')
-    result = c.fetchone()
-    
-    if result:
-        query_id, query_proc = result
-        # Mark as pending for this session
-        c.execute('''UPDATE query_procedures 
-                     SET status = 'pending', reviewer_session_id = ?, session_timestamp = CURRENT_TIMESTAMP
-                     WHERE id = ?''', (session_id, query_id))
+    conn = get_conn()
+
+    # Sweep stale sessions and claim the next free row in one transaction.
+    # The claim is a single UPDATE ... RETURNING, so two concurrent
+    # reviewers can never grab the same query and the whole operation
+    # commits with one fsync
+    with _write_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(_SWEEP_STALE_SQL)
+        result = conn.execute(_CLAIM_QUERY_SQL, (session_id,)).fetchone()
         conn.commit()
-        conn.close()
-        return query_id, query_proc
-    
-    conn.close()
+
+    if result:
+        return result
+
     return None, None
 
+@st.cache_data(show_spinner=False)
 def get_matching_choices(query_id):
-    """Get matching choices for a query"""
-    conn = sqlite3.connect('surgical_reviews.db')
-    c = conn.cursor()
-    c.execute('''SELECT choice_number, procedure_name, reasoning, description 
-                 FROM matching_choices WHERE query_procedure_id = ? 
-                 ORDER BY choice_number''', (query_id,))
-    choices = c.fetchall()
-    conn.close()
-    return choices
+    """Get matching choices for a query.
+
+    The choices for a query never change while a reviewer holds it, so
+    reruns between claim and submit are served from the in-process cache
+    instead of hitting the database.
+    """
+    with reader_conn() as conn:
+        return conn.execute(_GET_CHOICES_SQL, (query_id,)).fetchall()
+
+# Review writes are queued and drained by one background thread so a burst
+# of rapid clicks shares a single transaction (one fsync per batch) instead
+# of blocking each click on its own commit
+_review_queue = queue.Queue()
+
+def _review_writer_loop():
+    """Drain queued reviews every 50 ms or 16 rows, whichever comes first."""
+    conn = _open_conn()
+
+    while True:
+        batch = [_review_queue.get()]
+        deadline = time.monotonic() + 0.05
+        while len(batch) < 16:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_review_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # BEGIN IMMEDIATE takes the write lock up front, so the insert and
+        # the status flip land atomically: a review row never exists for a
+        # query still marked pending, and vice versa
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_INSERT_REVIEW_SQL, [row for row, _ in batch])
+            conn.executemany(_COMPLETE_QUERY_SQL,
+                             [(query_id,) for _, query_id in batch])
+            conn.commit()
+        except Exception as e:
+            # Reviews are the whole point of the app, and the user was
+            # already told the submit succeeded — never drop them. Fall
+            # back to writing each row on its own; anything still failing
+            # goes back on the queue for the next drain
+            _safe_rollback(conn)
+            print(f"Batched review write failed, retrying rows individually: {e}")
+            for item in batch:
+                row, query_id = item
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute(_INSERT_REVIEW_SQL, row)
+                    conn.execute(_COMPLETE_QUERY_SQL, (query_id,))
+                    conn.commit()
+                except Exception as row_error:
+                    _safe_rollback(conn)
+                    print(f"Review write failed, re-queued: {row_error}")
+                    _review_queue.put(item)
+            # Pause before the next drain so a persistent failure (disk
+            # full, locked database) does not spin the re-queued rows hot
+            time.sleep(1.0)
+        for _ in batch:
+            _review_queue.task_done()
+
+def _safe_rollback(conn):
+    """Roll back if a transaction is open; ignore rollback failures."""
+    try:
+        conn.rollback()
+    except sqlite3.Error:
+        pass
+
+@st.cache_resource
+def start_review_writer():
+    """Start the single background review writer for this server process."""
+    writer = threading.Thread(target=_review_writer_loop, daemon=True)
+    writer.start()
+    # Make sure queued reviews reach disk on shutdown
+    atexit.register(_review_queue.join)
+    return writer
 
 def save_review(query_id, query_proc, choice_num, choice_name, decision, comments, session_id):
-    """Save review to database and mark query as completed"""
-    conn = sqlite3.connect('surgical_reviews.db')
-    c = conn.cursor()
-    
-    # Save review
-    c.execute('''INSERT INTO reviews 
-                 (query_procedure_id, query_procedure, selected_choice, selected_procedure_name, 
-                  decision, reviewer_comments, reviewer_session_id)
-                 VALUES (?, ?, ?, ?, ?, ?, ?)''',
-              (query_id, query_proc, choice_num, choice_name, decision, comments, session_id))
-    
-    # Mark query as completed
-    c.execute('''UPDATE query_procedures 
-                 SET status = 'completed', reviewer_session_id = NULL 
-                 WHERE id = ?''', (query_id,))
-    
-    conn.commit()
-    conn.close()
+    """Queue a review for the background writer and mark the query done."""
+    _review_queue.put((
+        (query_id, query_proc, choice_num, choice_name, decision, comments, session_id),
+        query_id))
+
+    # Invalidate the cached sidebar listing only when a review lands, and
+    # drop the cached choices now that the query is released
+    st.session_state.review_version += 1
+    get_matching_choices.clear()
+
+@st.cache_data
+def get_recent_reviews(limit, version):
+    """Most recent reviews for the sidebar.
+
+    Cached by (limit, version); version only changes when save_review runs,
+    so the dozens of non-mutating reruns between submissions reuse the
+    memoized result instead of re-querying. Rows come straight off the
+    cursor — no DataFrame needed for a handful of display rows.
+    """
+    with reader_conn() as conn:
+        return conn.execute(_RECENT_REVIEWS_SQL, (limit,)).fetchall()
 
 def free_current_query(query_id):
     """Free up current query (for skip action)"""
-    conn = sqlite3.connect('surgical_reviews.db')
-    c = conn.cursor()
-    c.execute('''UPDATE query_procedures 
-                 SET status = 'free', reviewer_session_id = NULL 
-                 WHERE id = ?''', (query_id,))
-    conn.commit()
-    conn.close()
+    conn = get_conn()
+    with _write_lock:
+        conn.execute(_FREE_QUERY_SQL, (query_id,))
+        conn.commit()
+    get_matching_choices.clear()
 
 def cleanup_session(session_id):
     """Free up any queries held by this session"""
-    conn = sqlite3.connect('surgical_reviews.db')
-    c = conn.cursor()
-    c.execute('''UPDATE query_procedures 
-                 SET status = 'free', reviewer_session_id = NULL 
-                 WHERE reviewer_session_id = ? AND status = 'pending' ''', (session_id,))
-    conn.commit()
-    conn.close()
+    conn = get_conn()
+    with _write_lock:
+        conn.execute(_CLEANUP_SESSION_SQL, (session_id,))
+        conn.commit()
+
+@st.cache_resource
+def get_heartbeat_conn():
+    """Dedicated connection for heartbeat commits, opened once.
+
+    synchronous=OFF is set here, at open, and only ever applies to this
+    connection — toggling it on the shared writer connection would let
+    another session's commit silently land with durability off.
+    """
+    conn = _open_conn()
+    conn.execute("PRAGMA synchronous=OFF")
+    return conn
+
+_heartbeat_lock = threading.Lock()
 
 def update_session_heartbeat(session_id):
-    """Update session timestamp to keep it alive"""
-    conn = sqlite3.connect('surgical_reviews.db')
-    c = conn.cursor()
-    c.execute('''UPDATE query_procedures 
-                 SET session_timestamp = CURRENT_TIMESTAMP
-                 WHERE reviewer_session_id = ? AND status = 'pending' ''', (session_id,))
-    conn.commit()
-    conn.close()
+    """Update session timestamp to keep it alive.
+
+    The heartbeat is pure liveness metadata — losing one to a crash only
+    means the stale-session sweep reclaims the row a little sooner — so its
+    commit skips the WAL sync entirely rather than paying an fsync every
+    30 seconds per reviewer.
+    """
+    conn = get_heartbeat_conn()
+    with _heartbeat_lock:
+        conn.execute(_HEARTBEAT_SQL, (session_id,))
+        conn.commit()
+
+def _select_choice(choice_num):
+    """Button callback: record the selection without forcing an extra rerun."""
+    st.session_state.selected_choice = choice_num
 
 # Initialize database
 init_database()
 seed_sample_data()
+start_review_writer()
+if _INMEM:
+    start_inmem_persister()
 
 # Initialize session state
 if 'session_id' not in st.session_state:
@@ -253,21 +513,30 @@ if 'current_query_proc' not in st.session_state:
     st.session_state.current_query_proc = None
 if 'matching_choices' not in st.session_state:
     st.session_state.matching_choices = []
+if 'matching_choices_by_num' not in st.session_state:
+    st.session_state.matching_choices_by_num = {}
 if 'selected_choice' not in st.session_state:
     st.session_state.selected_choice = None
 if 'last_heartbeat' not in st.session_state:
     st.session_state.last_heartbeat = datetime.now()
+if 'review_version' not in st.session_state:
+    st.session_state.review_version = 0
 
-# Update heartbeat every 30 seconds to keep session alive
-current_time = datetime.now()
-if (current_time - st.session_state.last_heartbeat).seconds > 30:
-    if st.session_state.current_query_id:
+# Update heartbeat every 30 seconds to keep the claim alive. Gated on
+# holding a query so idle reruns skip the datetime work entirely;
+# total_seconds() instead of .seconds, which wraps at day boundaries
+if st.session_state.current_query_id is not None:
+    now = datetime.now()
+    if (now - st.session_state.last_heartbeat).total_seconds() > 30:
         update_session_heartbeat(st.session_state.session_id)
-    st.session_state.last_heartbeat = current_time
+        st.session_state.last_heartbeat = now
 
-# Register cleanup on session end
-import atexit
-atexit.register(cleanup_session, st.session_state.session_id)
+# No atexit registration here: the script body reruns on every
+# interaction, so registering per rerun grew the handler list without
+# bound and queued one DB write per historical rerun at shutdown.
+# Abandoned sessions are reclaimed by the stale-session sweep in
+# get_next_free_query instead, which also covers workers that never run
+# atexit hooks at all.
 
 # Load query if not loaded
 if st.session_state.current_query_id is None:
@@ -276,10 +545,23 @@ if st.session_state.current_query_id is None:
         st.session_state.current_query_id = query_id
         st.session_state.current_query_proc = query_proc
         st.session_state.matching_choices = get_matching_choices(query_id)
+        # Keyed view so selected-choice lookups are a dict probe, not a scan
+        st.session_state.matching_choices_by_num = {
+            c[0]: c for c in st.session_state.matching_choices}
     else:
         st.warning("No queries available for review at this time.")
         st.stop()
 
+# Sidebar: recent review activity
+with st.sidebar:
+    st.markdown("### 🕘 Recent Reviews")
+    recent = get_recent_reviews(10, st.session_state.review_version)
+    if recent:
+        for query_proc, decision, timestamp in recent:
+            st.caption(f"{query_proc} — {decision} ({timestamp})")
+    else:
+        st.caption("No reviews yet")
+
 # App title
 st.title("🏥 Surgical Procedure Matching Review")
 
@@ -287,109 +569,125 @@ st.title("🏥 Surgical Procedure Matching Review")
 st.caption(f"Session ID: {st.session_state.session_id[:8]}...")
 
 # Query procedure display
-st.markdown('<div class="main-header">Query Procedure:</div>', unsafe_allow_html=True)
-st.markdown(f'<div class="query-box"><h2>{st.session_state.current_query_proc}</h2></div>', unsafe_allow_html=True)
+st.markdown(
+    _QUERY_HEADER_HTML
+    + _QUERY_BOX_TMPL.format(st.session_state.current_query_proc),
+    unsafe_allow_html=True)
 
 # Display matching choices
-st.markdown('<div class="main-header">Matching Choices:</div>', unsafe_allow_html=True)
+st.markdown(_CHOICES_HEADER_HTML, unsafe_allow_html=True)
 
 for choice in st.session_state.matching_choices:
     choice_num, proc_name, reasoning, description = choice
     
     with st.container():
-        st.markdown(f'<div class="choice-box">', unsafe_allow_html=True)
-        
         col1, col2 = st.columns([3, 1])
-        
+
         with col1:
-            st.markdown(f'<div class="choice-header">Choice {choice_num}: {proc_name}</div>', unsafe_allow_html=True)
-        
+            # One sanitizer pass for the static box + header markup instead
+            # of separate open-div, header, and close-div markdown calls.
+            # Reasoning and description use native <details> disclosure, so
+            # expanding/collapsing happens in the browser DOM with no
+            # Streamlit widget reconciliation on rerun
+            st.markdown(
+                f'<div class="choice-box">'
+                f'<div class="choice-header">Choice {choice_num}: {proc_name}</div>'
+                f'<details><summary>📋 Reasoning</summary><p>{reasoning}</p></details>'
+                f'<details><summary>📝 Description</summary><p>{description}</p></details>'
+                f'</div>',
+                unsafe_allow_html=True)
+
         with col2:
             is_selected = st.session_state.selected_choice == choice_num
             button_type = "secondary" if is_selected else "primary"
             button_label = "✓ Selected" if is_selected else "Select"
             
-            if st.button(button_label, key=f"select_{choice_num}", type=button_type):
-                st.session_state.selected_choice = choice_num
-                st.rerun()
-        
-        # Expandable sections for reasoning and description
-        with st.expander("📋 Reasoning"):
-            st.write(reasoning)
-        
-        with st.expander("📝 Description"):
-            st.write(description)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            # on_click mutates state before the natural rerun, so no
+            # explicit st.rerun() (a second full script execution) is needed
+            st.button(button_label, key=f"select_{choice_num}", type=button_type,
+                      on_click=_select_choice, args=(choice_num,))
 
 # Display selected choice
 if st.session_state.selected_choice:
-    selected = [c for c in st.session_state.matching_choices if c[0] == st.session_state.selected_choice][0]
+    selected = st.session_state.matching_choices_by_num[st.session_state.selected_choice]
     st.info(f"✓ Currently selected: Choice {selected[0]} - {selected[1]}")
 
 # Review section
 st.markdown("---")
-st.markdown('<div class="main-header">Review Decision:</div>', unsafe_allow_html=True)
-
-# Review comments
-review_comment = st.text_area(
-    "Reviewer Comments:",
-    height=100,
-    placeholder="Enter any additional notes or feedback about this matching review...",
-    key="review_comment_input"
-)
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    if st.button("✅ Submit", type="primary", use_container_width=True):
-        if st.session_state.selected_choice:
-            selected = [c for c in st.session_state.matching_choices if c[0] == st.session_state.selected_choice][0]
-            save_review(
-                st.session_state.current_query_id,
-                st.session_state.current_query_proc,
-                st.session_state.selected_choice,
-                selected[1],
-                "SUBMIT",
-                review_comment,
-                st.session_state.session_id
-            )
-            st.success("✓ Review submitted successfully!")
-            # Reset for next query
-            st.session_state.current_query_id = None
-            st.session_state.current_query_proc = None
-            st.session_state.matching_choices = []
-            st.session_state.selected_choice = None
-            st.rerun()
-        else:
-            st.warning("Please select a choice first")
-
-with col2:
-    if st.button("⏭️ Skip", use_container_width=True):
-        free_current_query(st.session_state.current_query_id)
-        st.info("Query skipped and returned to queue")
-        # Reset for next query
-        st.session_state.current_query_id = None
-        st.session_state.current_query_proc = None
-        st.session_state.matching_choices = []
-        st.session_state.selected_choice = None
-        st.rerun()
+st.markdown(_DECISION_HEADER_HTML, unsafe_allow_html=True)
+
+# Typing a comment must not trigger a rerun per keystroke; the form defers
+# all widget state to the server until one of the submit buttons fires
+with st.form("review_form"):
+    review_comment = st.text_area(
+        "Reviewer Comments:",
+        height=100,
+        placeholder="Enter any additional notes or feedback about this matching review...",
+        key="review_comment_input"
+    )
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        submit_clicked = st.form_submit_button(
+            "✅ Submit", type="primary", use_container_width=True)
+
+    with col2:
+        skip_clicked = st.form_submit_button("⏭️ Skip", use_container_width=True)
 
-with col3:
-    if st.button("🚫 None of These", use_container_width=True):
+    with col3:
+        none_clicked = st.form_submit_button(
+            "🚫 None of These", use_container_width=True)
+
+if submit_clicked:
+    if st.session_state.selected_choice:
+        selected = st.session_state.matching_choices_by_num[st.session_state.selected_choice]
         save_review(
             st.session_state.current_query_id,
             st.session_state.current_query_proc,
-            None,
-            None,
-            "NONE",
+            st.session_state.selected_choice,
+            selected[1],
+            "SUBMIT",
             review_comment,
             st.session_state.session_id
         )
-        st.info("No suitable match recorded!")
+        st.success("✓ Review submitted successfully!")
         # Reset for next query
         st.session_state.current_query_id = None
         st.session_state.current_query_proc = None
         st.session_state.matching_choices = []
+        st.session_state.matching_choices_by_num = {}
         st.session_state.selected_choice = None
         st.rerun()
+    else:
+        st.warning("Please select a choice first")
+
+if skip_clicked:
+    free_current_query(st.session_state.current_query_id)
+    st.info("Query skipped and returned to queue")
+    # Reset for next query
+    st.session_state.current_query_id = None
+    st.session_state.current_query_proc = None
+    st.session_state.matching_choices = []
+    st.session_state.matching_choices_by_num = {}
+    st.session_state.selected_choice = None
+    st.rerun()
+
+if none_clicked:
+    save_review(
+        st.session_state.current_query_id,
+        st.session_state.current_query_proc,
+        None,
+        None,
+        "NONE",
+        review_comment,
+        st.session_state.session_id
+    )
+    st.info("No suitable match recorded!")
+    # Reset for next query
+    st.session_state.current_query_id = None
+    st.session_state.current_query_proc = None
+    st.session_state.matching_choices = []
+    st.session_state.matching_choices_by_num = {}
+    st.session_state.selected_choice = None
+    st.rerun()
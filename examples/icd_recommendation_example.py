@@ -2,6 +2,7 @@
 Example script demonstrating the ICD Code Recommendation utility for medical coders.
 """
 
+import functools
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -9,12 +10,24 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from medical_coding.utils.icd_recommender import ICDRecommender
 
 
+def _emit(lines):
+    """Write a block of output lines with one stdout write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_recommender():
+    """Shared recommender so each example reuses one fitted instance."""
+    return ICDRecommender()
+
+
 def example_basic_recommendations():
     """Basic ICD code recommendation example."""
     print("=== Basic ICD Code Recommendations ===\n")
     
     # Initialize the recommender
-    recommender = ICDRecommender()
+    recommender = _get_recommender()
     
     # Sample diagnosis texts that medical coders might encounter
     diagnosis_texts = [
@@ -25,31 +38,34 @@ def example_basic_recommendations():
         "45-year-old with persistent depressed mood, anhedonia, and sleep disturbances for past 3 weeks."
     ]
     
+    # Buffer each case's output and emit it in one write instead of ~30
+    # small print calls per case
     for i, diagnosis in enumerate(diagnosis_texts, 1):
-        print(f"Case {i}:")
-        print(f"Diagnosis: {diagnosis}")
-        print("\nTop 5 ICD Code Recommendations:")
-        print("-" * 50)
-        
+        lines = [f"Case {i}:",
+                 f"Diagnosis: {diagnosis}",
+                 "\nTop 5 ICD Code Recommendations:",
+                 "-" * 50]
+
         recommendations = recommender.recommend_icd_codes(diagnosis, top_k=5)
-        
+
         for rank, rec in enumerate(recommendations, 1):
-            print(f"{rank}. {rec['icd_code']} ({rec['confidence_score']})")
-            print(f"   {rec['description']}")
-            print(f"   Category: {rec['category']}")
+            lines.append(f"{rank}. {rec['icd_code']} ({rec['confidence_score']})")
+            lines.append(f"   {rec['description']}")
+            lines.append(f"   Category: {rec['category']}")
             if rec['matched_keywords']:
-                print(f"   Keywords matched: {', '.join(rec['matched_keywords'])}")
-            print()
-        
-        print("=" * 60)
-        print()
+                lines.append(f"   Keywords matched: {', '.join(rec['matched_keywords'])}")
+            lines.append("")
+
+        lines.append("=" * 60)
+        lines.append("")
+        _emit(lines)
 
 
 def example_medical_coder_workflow():
     """Simulate a medical coder's workflow with ICD recommendations."""
     print("=== Medical Coder Workflow Simulation ===\n")
     
-    recommender = ICDRecommender()
+    recommender = _get_recommender()
     
     # Simulate a complex medical case
     complex_case = """
@@ -91,7 +107,7 @@ def example_batch_processing():
     """Example of batch processing multiple cases."""
     print("=== Batch Processing Example ===\n")
     
-    recommender = ICDRecommender()
+    recommender = _get_recommender()
     
     # Multiple cases from a medical coder's daily workload
     daily_cases = [
@@ -106,30 +122,34 @@ def example_batch_processing():
     ]
     
     print(f"Processing {len(daily_cases)} cases in batch...")
-    
-    # Batch process all cases
+
+    # Batch process all cases: one call so the recommender scores the whole
+    # list with a single TF-IDF transform and matrix multiply rather than a
+    # per-case loop
     batch_results = recommender.batch_recommend(daily_cases, top_k=3)
     
     print("\nBatch Processing Results Summary:")
     print("-" * 50)
     
+    batch_lines = []
     for i, (case, recommendations) in enumerate(zip(daily_cases, batch_results), 1):
-        print(f"Case {i}: {case}")
-        
+        batch_lines.append(f"Case {i}: {case}")
+
         if recommendations:
             top_recommendation = recommendations[0]
-            print(f"   → Primary: {top_recommendation['icd_code']} ({top_recommendation['confidence_score']})")
-            print(f"     {top_recommendation['description']}")
+            batch_lines.append(f"   → Primary: {top_recommendation['icd_code']} ({top_recommendation['confidence_score']})")
+            batch_lines.append(f"     {top_recommendation['description']}")
         else:
-            print("   → No recommendations found")
-        print()
+            batch_lines.append("   → No recommendations found")
+        batch_lines.append("")
+    _emit(batch_lines)
 
 
 def example_keyword_search():
     """Example of searching ICD codes by keywords."""
     print("=== Keyword Search for Medical Coders ===\n")
     
-    recommender = ICDRecommender()
+    recommender = _get_recommender()
     
     # Common search terms medical coders might use
     search_terms = ["diabetes", "heart", "pneumonia", "depression", "hypertension"]
@@ -149,7 +169,7 @@ def example_interactive_coder_assistant():
     print("Enter diagnosis text for ICD code recommendations (or 'quit' to exit)")
     print("Example: 'Patient with chest pain and elevated troponin'")
     
-    recommender = ICDRecommender()
+    recommender = _get_recommender()
     
     while True:
         print("\n" + "-" * 50)
@@ -194,6 +214,9 @@ def example_interactive_coder_assistant():
 
 def main():
     """Run all examples."""
+    # Block buffering: without this every newline in the remaining print
+    # calls still costs a write syscall when stdout is a terminal
+    sys.stdout.reconfigure(line_buffering=False)
     try:
         example_basic_recommendations()
         example_medical_coder_workflow()
@@ -2,6 +2,9 @@
 Clinical Named Entity Recognition (NER) utility for extracting medical terms from text.
 """
 
+import functools
+import os
+import platform
 import re
 from typing import List, Dict, Tuple, Optional
 from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
@@ -12,29 +15,134 @@ class ClinicalNER:
     """
     A utility class for extracting clinical terms using Named Entity Recognition.
     """
+
+    # All fallback vocabularies merged into one alternation, with a named
+    # group per category: a single linear pass over the text yields every
+    # match tagged with its label, instead of four independent scans
+    _FALLBACK_PATTERNS = {
+        'DISEASE': r'diabetes|hypertension|cancer|pneumonia|asthma|arthritis|migraine|depression|anxiety',
+        'SYMPTOM': r'chest pain|shortness of breath|pain|fever|nausea|fatigue|headache|cough',
+        'MEDICATION': r'aspirin|ibuprofen|acetaminophen|insulin|metformin|lisinopril|atorvastatin',
+        'ANATOMY': r'heart|lung|liver|kidney|brain|stomach|chest|abdomen|head|neck'
+    }
+    _FALLBACK_RE = re.compile(
+        '|'.join(rf'\b(?P<{label}>{pattern})\b'
+                 for label, pattern in _FALLBACK_PATTERNS.items()),
+        re.IGNORECASE)
+
+    # Compiled once at class creation; preprocess_text runs per document,
+    # so it should not pay the re-cache lookup on every call
+    _WHITESPACE_RE = re.compile(r'\s+')
+
     
-    def __init__(self, model_name: str = "d4data/biomedical-ner-all"):
+    def __init__(self, model_name: str = "d4data/biomedical-ner-all",
+                 dtype: Optional[str] = None, backend: str = "torch",
+                 batch_size: int = 16, onnx_dir: Optional[str] = None,
+                 compile_model: bool = False):
         """
         Initialize the Clinical NER model.
-        
+
         Args:
             model_name (str): HuggingFace model name for biomedical NER
+            dtype (str, optional): Reduced-precision mode for inference.
+                "float16"/"bfloat16" halve weight bandwidth on GPU; "int8"
+                applies dynamic quantization to linear layers for CPU
+                inference. "auto" picks bfloat16 on GPU and int8 on CPU.
+                Default keeps the model in full precision.
+            backend (str): "torch" (default) runs the PyTorch forward;
+                "onnx" exports the model once and runs it through ONNX
+                Runtime's optimized graph, falling back to PyTorch when
+                optimum/onnxruntime are not installed.
+            batch_size (int): Sequences per forward pass when
+                batch_extract feeds the pipeline a list of texts.
+            onnx_dir (str, optional): Directory for the exported ONNX
+                graph. When set, the export from the first run is saved
+                there and later constructions load it instead of
+                re-exporting.
+            compile_model (bool): Fuse the PyTorch forward with
+                torch.compile (PyTorch 2+). Pays a one-off compile cost on
+                the first calls, so it suits long-running services rather
+                than one-shot scripts.
         """
         self.model_name = model_name
+        self.dtype = dtype
+        self.backend = backend
+        self.batch_size = batch_size
+        self.onnx_dir = onnx_dir
+        self.compile_model = compile_model
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if self.dtype == "auto":
+            self.dtype = "bfloat16" if self.device == "cuda" else "int8"
+        # Per-instance memo cache: a class-level lru_cache would hold self
+        # (and the loaded model) for the life of the process
+        self._pipeline_entities = functools.lru_cache(maxsize=256)(self._pipeline_entities)
         self._load_model()
-    
+
+    def _load_onnx_model(self):
+        """Load the model through ONNX Runtime, exporting it if necessary.
+
+        The export is the slow part, so when onnx_dir is set it happens at
+        most once per machine; every later construction deserializes the
+        optimized graph straight from disk.
+        """
+        from optimum.onnxruntime import ORTModelForTokenClassification
+        if self.onnx_dir and os.path.isdir(self.onnx_dir) and os.listdir(self.onnx_dir):
+            return ORTModelForTokenClassification.from_pretrained(self.onnx_dir)
+
+        model = ORTModelForTokenClassification.from_pretrained(
+            self.model_name, export=True)
+        if self.onnx_dir:
+            os.makedirs(self.onnx_dir, exist_ok=True)
+            model.save_pretrained(self.onnx_dir)
+        return model
+
     def _load_model(self):
         """Load the NER model and tokenizer."""
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForTokenClassification.from_pretrained(self.model_name)
+            # The Rust tokenizer parallelizes across the batch; without the
+            # explicit flag a model repo missing fast-tokenizer files can
+            # silently select the serial Python implementation
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name,
+                                                           use_fast=True)
+            if self.backend == "onnx":
+                try:
+                    self.model = self._load_onnx_model()
+                except ImportError:
+                    print("optimum/onnxruntime not installed, using PyTorch backend...")
+                    self.backend = "torch"
+            if self.backend == "torch":
+                model_kwargs = {}
+                if self.dtype == "float16" and self.device == "cuda":
+                    model_kwargs['torch_dtype'] = torch.float16
+                elif self.dtype == "bfloat16" and self.device == "cuda":
+                    model_kwargs['torch_dtype'] = torch.bfloat16
+                self.model = AutoModelForTokenClassification.from_pretrained(
+                    self.model_name, **model_kwargs)
+                if self.dtype == "int8" and self.device == "cpu":
+                    # fbgemm targets x86 VNNI; ARM (Apple Silicon, Graviton)
+                    # needs the qnnpack kernels instead
+                    if platform.machine().lower() in ("arm64", "aarch64") and \
+                            "qnnpack" in torch.backends.quantized.supported_engines:
+                        torch.backends.quantized.engine = "qnnpack"
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8)
+                if self.compile_model and hasattr(torch, "compile"):
+                    # After quantization so the compiler sees the final
+                    # graph; dynamic=True keeps varying sequence lengths
+                    # from triggering a recompile per shape
+                    try:
+                        self.model = torch.compile(self.model,
+                                                   mode="reduce-overhead",
+                                                   dynamic=True)
+                    except RuntimeError as e:
+                        print(f"torch.compile unavailable, running eager: {e}")
             self.nlp_pipeline = pipeline(
                 "ner",
                 model=self.model,
                 tokenizer=self.tokenizer,
                 aggregation_strategy="simple",
-                device=0 if self.device == "cuda" else -1
+                device=0 if self.device == "cuda" else -1,
+                batch_size=self.batch_size
             )
             print(f"Loaded model: {self.model_name}")
         except Exception as e:
@@ -52,9 +160,9 @@ class ClinicalNER:
         Returns:
             str: Preprocessed text
         """
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        return text
+        # One pass with the precompiled pattern normalizes all runs of
+        # whitespace; strip trims the ends without another walk
+        return self._WHITESPACE_RE.sub(' ', text).strip()
     
     def extract_entities(self, text: str, confidence_threshold: float = 0.5) -> List[Dict]:
         """
@@ -70,72 +178,82 @@ class ClinicalNER:
         preprocessed_text = self.preprocess_text(text)
         
         if self.nlp_pipeline is None:
-            return self._fallback_extraction(preprocessed_text)
+            return self._fallback_extraction(preprocessed_text,
+                                             confidence_threshold)
         
         try:
-            entities = self.nlp_pipeline(preprocessed_text)
-            
-            filtered_entities = []
-            for entity in entities:
-                if entity['score'] >= confidence_threshold:
-                    filtered_entities.append({
-                        'text': entity['word'],
-                        'label': entity['entity_group'],
-                        'confidence': entity['score'],
-                        'start': entity['start'],
-                        'end': entity['end']
-                    })
-            
-            return filtered_entities
-            
+            entities = self._pipeline_entities(preprocessed_text)
+
+            return self._filter_entities(entities, confidence_threshold)
+
         except Exception as e:
             print(f"Error during entity extraction: {e}")
-            return self._fallback_extraction(preprocessed_text)
+            return self._fallback_extraction(preprocessed_text,
+                                             confidence_threshold)
+
+    def _pipeline_entities(self, text: str) -> List[Dict]:
+        """Raw pipeline output for a preprocessed text, memoized (wrapped
+        per instance with lru_cache in __init__).
+
+        Repeated extractions of the same text (common when several views of
+        one document are requested, or across a test class sharing a sample
+        text) tokenize and run the model forward once; the confidence
+        threshold is applied to the cached output afterwards, so different
+        thresholds also share one pass.
+        """
+        # inference_mode skips autograd bookkeeping on the forward pass
+        with torch.inference_mode():
+            return self.nlp_pipeline(text)
+
+    def _filter_entities(self, entities: List[Dict], confidence_threshold: float) -> List[Dict]:
+        """Convert raw pipeline output to the public entity format."""
+        filtered_entities = []
+        for entity in entities:
+            # Plain float: reduced-precision models emit numpy half/bfloat
+            # scalars, which surprise downstream arithmetic and json output
+            score = float(entity['score'])
+            if score >= confidence_threshold:
+                filtered_entities.append({
+                    'text': entity['word'],
+                    'label': entity['entity_group'],
+                    'confidence': score,
+                    'start': entity['start'],
+                    'end': entity['end']
+                })
+
+        return filtered_entities
     
-    def _fallback_extraction(self, text: str) -> List[Dict]:
+    # Fixed confidence assigned to pattern-matched entities
+    _FALLBACK_CONFIDENCE = 0.8
+
+    def _fallback_extraction(self, text: str,
+                             confidence_threshold: float = 0.5) -> List[Dict]:
         """
         Fallback method using pattern matching for common medical terms.
-        
+
         Args:
             text (str): Input text
-            
+            confidence_threshold (float): Minimum confidence score
+
         Returns:
             List[Dict]: List of extracted entities
         """
-        medical_patterns = {
-            'DISEASE': r'\b(?:diabetes|hypertension|cancer|pneumonia|asthma|arthritis|migraine|depression|anxiety)\b',
-            'SYMPTOM': r'\b(?:pain|fever|nausea|fatigue|headache|cough|shortness of breath|chest pain)\b',
-            'MEDICATION': r'\b(?:aspirin|ibuprofen|acetaminophen|insulin|metformin|lisinopril|atorvastatin)\b',
-            'ANATOMY': r'\b(?:heart|lung|liver|kidney|brain|stomach|chest|abdomen|head|neck)\b'
-        }
-        
-        entities = []
-        for label, pattern in medical_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                entities.append({
-                    'text': match.group(),
-                    'label': label,
-                    'confidence': 0.8,
-                    'start': match.start(),
-                    'end': match.end()
-                })
-        
-        return entities
+        # Every pattern hit carries the same fixed confidence, so the
+        # threshold comparison resolves once up front rather than per
+        # entity; a threshold above it short-circuits the scan entirely
+        if self._FALLBACK_CONFIDENCE < confidence_threshold:
+            return []
+
+        return [{
+            'text': match.group(),
+            'label': match.lastgroup,
+            'confidence': self._FALLBACK_CONFIDENCE,
+            'start': match.start(),
+            'end': match.end()
+        } for match in self._FALLBACK_RE.finditer(text)]
     
-    def extract_by_category(self, text: str, category: str = None) -> Dict[str, List[str]]:
-        """
-        Extract entities grouped by category.
-        
-        Args:
-            text (str): Input text
-            category (str): Specific category to extract (optional)
-            
-        Returns:
-            Dict[str, List[str]]: Entities grouped by category
-        """
-        entities = self.extract_entities(text)
-        
+    def _group_by_category(self, entities: List[Dict], category: str = None) -> Dict[str, List[str]]:
+        """Group already-extracted entities by their category label."""
         categorized = {}
         for entity in entities:
             label = entity['label']
@@ -144,25 +262,91 @@ class ClinicalNER:
                     categorized[label] = []
                 if entity['text'] not in categorized[label]:
                     categorized[label].append(entity['text'])
-        
+
         return categorized
+
+    def extract_by_category(self, text: str, category: str = None,
+                            entities: Optional[List[Dict]] = None) -> Dict[str, List[str]]:
+        """
+        Extract entities grouped by category.
+
+        Args:
+            text (str): Input text
+            category (str): Specific category to extract (optional)
+            entities (List[Dict], optional): Already-extracted entities for
+                this text; when given, the model pass is skipped
+
+        Returns:
+            Dict[str, List[str]]: Entities grouped by category
+        """
+        if entities is None:
+            entities = self.extract_entities(text)
+        return self._group_by_category(entities, category)
+
+    def extract_entities_and_categories(self, text: str) -> Tuple[List[Dict], Dict[str, List[str]]]:
+        """
+        Extract entities and their category grouping in a single model pass.
+
+        Callers that need both views of the same text should use this instead
+        of calling extract_entities and extract_by_category separately, which
+        would run the NER pipeline twice.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            Tuple[List[Dict], Dict[str, List[str]]]: Entities and grouping
+        """
+        entities = self.extract_entities(text)
+        return entities, self._group_by_category(entities)
     
-    def batch_extract(self, texts: List[str]) -> List[List[Dict]]:
+    def batch_extract(self, texts: List[str],
+                      confidence_threshold: float = 0.5) -> List[List[Dict]]:
         """
         Extract entities from multiple texts.
-        
+
+        The whole list goes through the pipeline in one call, so
+        tokenization pads to the longest text and the model runs batched
+        forward passes (batch_size set at pipeline construction) instead of
+        one launch per text.
+
         Args:
             texts (List[str]): List of input texts
-            
+            confidence_threshold (float): Minimum confidence score
+
         Returns:
             List[List[Dict]]: List of entity lists for each text
         """
-        results = []
-        for text in texts:
-            entities = self.extract_entities(text)
-            results.append(entities)
-        
-        return results
+        preprocessed = [self.preprocess_text(text) for text in texts]
+
+        if self.nlp_pipeline is None:
+            return [self._fallback_extraction(text, confidence_threshold)
+                    for text in preprocessed]
+
+        try:
+            # Sort by token count so each padded batch holds similar-length
+            # texts; a mixed batch otherwise pads everything to its longest
+            # member and wastes the extra forward compute
+            lengths = self.tokenizer(preprocessed, add_special_tokens=False,
+                                     return_length=True)['length']
+            order = sorted(range(len(preprocessed)), key=lambda i: lengths[i])
+
+            with torch.inference_mode():
+                sorted_entities = self.nlp_pipeline(
+                    [preprocessed[i] for i in order])
+
+            # Undo the permutation so results line up with the input texts
+            batch_entities = [None] * len(preprocessed)
+            for rank, i in enumerate(order):
+                batch_entities[i] = sorted_entities[rank]
+
+            return [self._filter_entities(entities, confidence_threshold)
+                    for entities in batch_entities]
+
+        except Exception as e:
+            print(f"Error during batch entity extraction: {e}")
+            return [self._fallback_extraction(text, confidence_threshold)
+                    for text in preprocessed]
     
     def get_entity_summary(self, text: str) -> Dict:
         """
@@ -174,8 +358,9 @@ class ClinicalNER:
         Returns:
             Dict: Summary statistics
         """
+        # One model pass serves both the flat list and the grouping
         entities = self.extract_entities(text)
-        categories = self.extract_by_category(text)
+        categories = self.extract_by_category(text, entities=entities)
         
         summary = {
             'total_entities': len(entities),
@@ -0,0 +1,29 @@
+"""
+Pytest configuration for the test suite.
+
+The two test modules are independent, so they parallelize cleanly with
+pytest-xdist:
+
+    pytest -n auto --dist loadgroup tests/
+
+The grouping below keeps every test that shares a heavyweight fixture
+(the NER model or the fitted recommender index) on one worker, so each
+model is loaded once per run instead of once per worker.
+"""
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): schedule tests in the same group on one "
+        "pytest-xdist worker")
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if 'test_clinical_ner' in item.nodeid:
+            item.add_marker(pytest.mark.xdist_group(name='ner'))
+        elif 'test_icd_recommender' in item.nodeid:
+            item.add_marker(pytest.mark.xdist_group(name='icd'))
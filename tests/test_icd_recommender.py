@@ -3,6 +3,7 @@ Unit tests for the ICD Code Recommender utility.
 """
 
 import unittest
+from unittest import mock
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -14,9 +15,14 @@ from medical_coding.utils.clinical_ner import ClinicalNER
 class TestICDRecommender(unittest.TestCase):
     """Test cases for ICD Code Recommender functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the recommender once for the whole class; re-fitting the
+        index per test dominated the suite's runtime."""
+        cls.recommender = ICDRecommender()
+
     def setUp(self):
-        """Set up test fixtures."""
-        self.recommender = ICDRecommender()
+        """Set up per-test fixtures."""
         self.sample_diagnosis = "Patient presents with chest pain and shortness of breath. History of diabetes."
         self.diabetes_text = "Type 2 diabetes mellitus with poor glycemic control"
         self.heart_attack_text = "Acute myocardial infarction with ST elevation"
@@ -215,6 +221,17 @@ class TestICDRecommender(unittest.TestCase):
             scores = [rec['confidence_score'] for rec in recommendations]
             self.assertEqual(scores, sorted(scores, reverse=True))
     
+    def test_search_by_keyword_substring_matches(self):
+        """Test that indexed searches keep substring semantics."""
+        # 'heart' is a whole word in the cardiac descriptions (an index
+        # hit) and a substring of the keyword 'heartburn' on K21.9; both
+        # kinds of match must appear in the results
+        results = self.recommender.search_by_keyword("heart", max_results=20)
+        codes = [result['icd_code'] for result in results]
+
+        self.assertIn('I50.9', codes)  # 'heart failure' in the description
+        self.assertIn('K21.9', codes)  # 'heart' inside keyword 'heartburn'
+
     def test_top_k_parameter(self):
         """Test that top_k parameter works correctly."""
         # Test different values of top_k
@@ -223,14 +240,26 @@ class TestICDRecommender(unittest.TestCase):
             self.assertLessEqual(len(recommendations), k)
             self.assertLessEqual(len(recommendations), len(self.recommender.icd_codes))
 
+    def test_top_k_without_full_sort(self):
+        """Test that top-k selection does not fall back to a full sort."""
+        with mock.patch('builtins.sorted',
+                        side_effect=AssertionError('full sort used')):
+            recommendations = self.recommender.recommend_icd_codes(
+                "uncontrolled essential hypertension", top_k=3)
+
+        self.assertLessEqual(len(recommendations), 3)
+        scores = [rec['confidence_score'] for rec in recommendations]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
 
 class TestICDRecommenderEdgeCases(unittest.TestCase):
     """Test edge cases for ICD Recommender."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.recommender = ICDRecommender()
-    
+    @classmethod
+    def setUpClass(cls):
+        """Share one recommender across the edge-case tests."""
+        cls.recommender = ICDRecommender()
+
     def test_very_long_diagnosis(self):
         """Test with very long diagnosis text."""
         long_diagnosis = "Patient presents with chest pain. " * 100